@@ -9,8 +9,19 @@ import csv
 import json
 import argparse
 from pathlib import Path
-from collections import defaultdict, OrderedDict
-from typing import Dict, List, Any, Optional, Protocol
+from collections import defaultdict
+from itertools import islice
+from typing import Dict, List, Any, Iterator, Optional, Protocol, Set, Tuple
+
+try:
+   import cisv  # Optional SIMD CSV parser
+except ImportError:
+   cisv = None
+
+try:
+   import orjson  # Optional fast JSON encoder
+except ImportError:
+   orjson = None
 
 
 # Interfaces (Protocol classes for dependency inversion)
@@ -26,6 +37,8 @@ class DataReader(Protocol):
 
 class GroupStrategy(Protocol):
    def generate_groups(self, rows: List[Dict]) -> Dict[str, List[str]]: ...
+   def add_row(self, groups: Dict[str, List[str]], hostname: str, row: Dict,
+               vm_grouped: Set[str]) -> None: ...
 
 
 class InventoryBuilder(Protocol):
@@ -87,6 +100,11 @@ class EnvConfig:
 class CSVReader:
    """Single Responsibility: CSV data reading"""
    
+   # Files larger than this are parsed with cisv's multithreaded reader
+   PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+   # Columns drawn from a small vocabulary; their values are deduplicated
+   INTERN_COLS = frozenset({"vm_owner", "vm_state", "vm_groups"})
+   
    def __init__(self, required_cols: Optional[set] = None):
        self.required_cols = required_cols or {"vm_name", "vm_ip_addr"}
    
@@ -94,35 +112,70 @@ class CSVReader:
        if not path.exists():
            raise FileNotFoundError(f"CSV not found: {path}")
        
+       records = self._records(path)
+       headers = [h.strip() for h in next(records, [])]
+       
+       if not headers:
+           raise ValueError("Empty CSV or missing header")
+       
+       missing = self.required_cols - set(headers)
+       if missing:
+           raise ValueError(f"Missing required columns: {', '.join(sorted(missing))}")
+       
+       # Low-cardinality columns share one str object per distinct value
+       intern_cols = self.INTERN_COLS.intersection(headers)
+       interned: Dict[str, str] = {}
+       
+       # Short records are padded with None like DictReader's restval, so
+       # every header key is present in every row
+       width = len(headers)
+       
        rows = []
-       with path.open("r", encoding="utf-8-sig", newline="") as f:
-           reader = csv.DictReader(f)
-           headers = [h.strip() for h in (reader.fieldnames or [])]
-           
-           if not headers:
-               raise ValueError("Empty CSV or missing header")
-           
-           missing = self.required_cols - set(headers)
-           if missing:
-               raise ValueError(f"Missing required columns: {', '.join(sorted(missing))}")
-           
-           for raw in reader:
-               row = {k.strip(): (v.strip() if isinstance(v, str) else v) 
-                      for k, v in raw.items()}
-               if row.get("vm_name"):
-                   rows.append(row)
+       for raw in records:
+           if len(raw) < width:
+               raw = raw + [None] * (width - len(raw))
+           row = dict(zip(headers, raw))
+           if row.get("vm_name"):
+               for col in intern_cols:
+                   value = row.get(col)
+                   if value is not None:
+                       row[col] = interned.setdefault(value, value)
+               rows.append(row)
        
        self._validate_uniqueness(rows)
        return rows
    
+   def _records(self, path: Path) -> Iterator[List[str]]:
+       """Yield stripped CSV records, header first"""
+       large = path.stat().st_size > self.PARALLEL_MIN_BYTES
+       
+       if cisv is not None:
+           try:
+               # Native parser: whole file tokenized in one C call
+               records = cisv.parse_file(str(path), skip_empty_lines=True,
+                                         parallel=large)
+           except (cisv.CisvError, ValueError):
+               records = None  # csv.reader below is the reference parser
+           if records is not None:
+               if records and records[0]:
+                   records[0][0] = records[0][0].lstrip("\ufeff")
+               # Strip here rather than via trim=True so both paths agree
+               for raw in records:
+                   yield [v.strip() for v in raw]
+               return
+       
+       with path.open("r", encoding="utf-8-sig", newline="") as f:
+           for raw in csv.reader(f):
+               yield [v.strip() for v in raw]
+   
    def _validate_uniqueness(self, rows: List[Dict]) -> None:
-       seen = {}
+       seen = set()
        dups = []
        for r in rows:
            name = r["vm_name"]
            if name in seen:
                dups.append(name)
-           seen[name] = True
+           seen.add(name)
        if dups:
            sys.stderr.write(f"WARN: Duplicate vm_name: {', '.join(sorted(set(dups)))}\n")
 
@@ -134,36 +187,60 @@ class DynamicGrouper:
        self.config = config
        self.flags = config.get_flags()
        self.state_map = config.get_state_map()
+       # Group keys are formatted once per distinct raw value
+       self._owner_keys: Dict[str, str] = {}
+       self._state_keys: Dict[str, str] = {}
+       self._custom_keys: Dict[str, Tuple[Tuple[str, ...], bool]] = {}
+       self.by_custom = bool(self.flags.get("group_by_custom"))
+       self.by_owner = bool(self.flags.get("group_by_owner"))
+       self.by_state = bool(self.flags.get("group_by_state"))
    
    def generate_groups(self, rows: List[Dict]) -> Dict[str, List[str]]:
        groups = defaultdict(list)
-       
+       vm_grouped = set()
        for row in rows:
-           hostname = row["vm_name"]
-           
-           # Custom group from vm_group column
-           if self.flags.get("group_by_custom") and row.get("vm_groups"):
-               for group in row["vm_groups"].split(","):
-                   group = group.strip()
-                   if group:
-                       groups[f"{group}"].append(hostname)
-           
-           # Owner groups
-           if self.flags.get("group_by_owner") and row.get("vm_owner"):
-               groups[f"owner_{row['vm_owner']}"].append(hostname)
-           
-           # State groups
-           if self.flags.get("group_by_state") and row.get("vm_state"):
-               state = self._normalize_state(row["vm_state"])
-               groups[f"state_{state}"].append(hostname)
-           
-           # Default group if no custom group
-           if not any(hostname in hosts for group, hosts in groups.items() 
-                     if group.startswith("vm_")):
-               groups["ungrouped"].append(hostname)
-       
+           self.add_row(groups, row["vm_name"], row, vm_grouped)
        return dict(groups)
    
+   def add_row(self, groups: Dict[str, List[str]], hostname: str, row: Dict,
+               vm_grouped: Set[str]) -> None:
+       """Append hostname to every group the row belongs to"""
+       # Custom group from vm_group column
+       if self.by_custom and (custom := row.get("vm_groups")):
+           parsed = self._custom_keys.get(custom)
+           if parsed is None:
+               parsed = self._custom_keys[custom] = self._parse_custom(custom)
+           keys, in_vm_group = parsed
+           for key in keys:
+               groups[key].append(hostname)
+           if in_vm_group:
+               vm_grouped.add(hostname)
+       
+       # Owner groups
+       if self.by_owner and (owner := row.get("vm_owner")):
+           key = self._owner_keys.get(owner)
+           if key is None:
+               key = self._owner_keys[owner] = f"owner_{owner}"
+           groups[key].append(hostname)
+       
+       # State groups
+       if self.by_state and (state := row.get("vm_state")):
+           key = self._state_keys.get(state)
+           if key is None:
+               key = self._state_keys[state] = f"state_{self._normalize_state(state)}"
+           groups[key].append(hostname)
+       
+       # Default group if no custom vm_* group; vm_grouped spans all rows
+       # so far, so a duplicate vm_name already in one is not ungrouped
+       if hostname not in vm_grouped:
+           groups["ungrouped"].append(hostname)
+   
+   @staticmethod
+   def _parse_custom(value: str) -> Tuple[Tuple[str, ...], bool]:
+       """Split a vm_groups cell into group names and whether any is vm_*"""
+       keys = tuple(g for g in (g.strip() for g in value.split(",")) if g)
+       return keys, any(k.startswith("vm_") for k in keys)
+   
    def _normalize_state(self, state: str) -> str:
        return self.state_map.get((state or "").strip().lower(), "poweredon")
 
@@ -171,68 +248,109 @@ class DynamicGrouper:
 class AnsibleInventoryBuilder:
    """Single Responsibility: Build Ansible inventory format"""
    
+   # vm_uuid values meaning "no UUID"
+   NONE_UUIDS = frozenset({None, "", "none", "None", "NONE"})
+   
    def __init__(self, grouper: GroupStrategy, config: ConfigProvider):
        self.grouper = grouper
        self.state_map = config.get_state_map()
+       # Cache is keyed on raw values; only already-normalized keys are safe seeds
+       self._state_cache: Dict[str, str] = {
+           k: v for k, v in self.state_map.items() if k == k.strip().lower()
+       }
    
    def build(self, rows: List[Dict]) -> Dict[str, Any]:
+       """Build the inventory, taking ownership of (and extending) the row dicts"""
        hostvars = {}
        uuid_index = {}
+       groups = defaultdict(list)
+       vm_grouped = set()
+       # Bound methods hoisted out of the per-row loop
+       add_to_groups = self.grouper.add_row
+       normalize_state = self._normalize_state
+       none_uuids = self.NONE_UUIDS
        
+       # Single pass: hostvars and group membership together
        for row in rows:
            hostname = row["vm_name"]
            vm_uuid = row.get("vm_uuid", "")
-           vm_uuid = None if (vm_uuid or "").lower() == "none" else vm_uuid
            
-           # Pass all CSV columns as hostvars
-           hostvar = {k: v for k, v in row.items()}
+           # Pass all CSV columns as hostvars; the row dict is reused as-is
+           hostvar = row
            
            # Add computed fields
            hostvar["ansible_host"] = row.get("vm_ip_addr", "")
            if "vm_state" in row:
-               hostvar["vmware_state"] = self._normalize_state(row["vm_state"])
+               hostvar["vmware_state"] = normalize_state(row["vm_state"])
            
            hostvars[hostname] = hostvar
            
-           if vm_uuid:
+           if vm_uuid not in none_uuids:
                uuid_index[vm_uuid] = hostname
-       
-       # Get groups
-       groups = self.grouper.generate_groups(rows)
+           
+           add_to_groups(groups, hostname, row, vm_grouped)
        
        # Build inventory
-       inv = OrderedDict()
+       inv = {}
        inv["_meta"] = {"hostvars": hostvars}
        
-       for group in sorted(groups):
+       group_names = sorted(groups)
+       for group in group_names:
            inv[group] = {"hosts": sorted(groups[group])}
        
        inv["all"] = {
-           "children": sorted(groups.keys()),
+           "children": group_names,
            "vars": {"uuid_index": uuid_index}
        }
        
        return inv
    
    def _normalize_state(self, state: str) -> str:
-       return self.state_map.get((state or "").strip().lower(), "poweredon")
+       cached = self._state_cache.get(state)
+       if cached is not None:
+           return cached
+       norm = self.state_map.get((state or "").strip().lower(), "poweredon")
+       self._state_cache[state] = norm
+       return norm
 
 
 class InventoryOutput:
    """Single Responsibility: Output formatting"""
    
    @staticmethod
-   def as_json(data: Any) -> str:
-       return json.dumps(data, indent=2, ensure_ascii=False)
+   def orjson_compatible(state_map: Dict[str, Any]) -> bool:
+       """True if orjson output matches json's for this inventory"""
+       # CSV values are always str; only INV_STATE_MAP can inject other JSON
+       # values, which orjson encodes differently (e.g. Infinity as null)
+       return all(isinstance(v, str) for v in state_map.values())
+   
+   @staticmethod
+   def write_json(data: Any, use_orjson: bool = True) -> None:
+       """Stream JSON to stdout without an intermediate str copy"""
+       if use_orjson and orjson is not None:
+           try:
+               payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+           except orjson.JSONEncodeError:
+               payload = None  # e.g. ints beyond 64 bits; json handles them
+           if payload is not None:
+               sys.stdout.flush()
+               sys.stdout.buffer.write(payload)
+               sys.stdout.buffer.write(b"\n")
+               sys.stdout.buffer.flush()
+               return
+       chunks = json.JSONEncoder(indent=2, ensure_ascii=False).iterencode(data)
+       while batch := "".join(islice(chunks, 8192)):
+           sys.stdout.write(batch)
+       sys.stdout.write("\n")
    
    @staticmethod
-   def print_list(inventory: Dict) -> None:
-       print(InventoryOutput.as_json(inventory))
+   def print_list(inventory: Dict, use_orjson: bool = True) -> None:
+       InventoryOutput.write_json(inventory, use_orjson)
    
    @staticmethod
-   def print_host(inventory: Dict, hostname: str) -> None:
+   def print_host(inventory: Dict, hostname: str, use_orjson: bool = True) -> None:
        hostvars = inventory.get("_meta", {}).get("hostvars", {})
-       print(InventoryOutput.as_json(hostvars.get(hostname, {})))
+       InventoryOutput.write_json(hostvars.get(hostname, {}), use_orjson)
 
 
 class Application:
@@ -266,10 +384,11 @@ class Application:
            inventory = builder.build(rows)
            
            # Output
+           use_orjson = InventoryOutput.orjson_compatible(config.get_state_map())
            if args.host:
-               InventoryOutput.print_host(inventory, args.host)
+               InventoryOutput.print_host(inventory, args.host, use_orjson)
            else:
-               InventoryOutput.print_list(inventory)
+               InventoryOutput.print_list(inventory, use_orjson)
                
        except (FileNotFoundError, ValueError) as e:
            sys.stderr.write(f"ERROR: {e}\n")